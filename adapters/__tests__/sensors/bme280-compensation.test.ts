@@ -0,0 +1,129 @@
+import { describe, it, expect } from "vitest";
+import { execFileSync } from "node:child_process";
+import { getHelpersDir } from "../../src/sensors/exec-helper.js";
+
+// ---------------------------------------------------------------------------
+// read_bme280.py compensates raw readings with Bosch's integer fixed-point
+// formulas. This checks them against the datasheet's floating-point formulas
+// (BME280 datasheet §8.1), which the helper used before: every reading must
+// agree to within one output LSB (0.1 °C, 0.1 %RH, 0.01 hPa).
+//
+// Runs the real helper through python3; skipped where python3 is missing.
+// ---------------------------------------------------------------------------
+
+interface Calibration {
+  T: number[];
+  P: number[];
+  H: number[];
+}
+
+/** Calibration of a real BME280 module */
+const CAL: Calibration = {
+  T: [28485, 26735, 50],
+  P: [36738, -10635, 3024, 7642, -63, -7, 9900, -10230, 4285],
+  H: [75, 362, 0, 323, 50, 30],
+};
+
+const SAMPLES = 3000;
+
+function hasPython(): boolean {
+  try {
+    execFileSync("python3", ["--version"], { stdio: "ignore" });
+    return true;
+  } catch {
+    return false;
+  }
+}
+
+/** Deterministic PRNG (mulberry32) so failures are reproducible */
+function prng(seed: number): () => number {
+  return () => {
+    seed = (seed + 0x6d2b79f5) | 0;
+    let t = Math.imul(seed ^ (seed >>> 15), 1 | seed);
+    t = (t + Math.imul(t ^ (t >>> 7), 61 | t)) ^ t;
+    return ((t ^ (t >>> 14)) >>> 0) / 4294967296;
+  };
+}
+
+/** Datasheet floating-point compensation. Returns [°C, %RH, hPa]. */
+function compensateFloat(cal: Calibration, rawP: number, rawT: number, rawH: number): number[] {
+  const [T1, T2, T3] = cal.T;
+  const [P1, P2, P3, P4, P5, P6, P7, P8, P9] = cal.P;
+  const [H1, H2, H3, H4, H5, H6] = cal.H;
+
+  let var1 = (rawT / 16384 - T1 / 1024) * T2;
+  let var2 = (rawT / 131072 - T1 / 8192) ** 2 * T3;
+  const tFine = var1 + var2;
+  const temperature = tFine / 5120;
+
+  var1 = tFine / 2 - 64000;
+  var2 = (var1 * var1 * P6) / 32768;
+  var2 = var2 + var1 * P5 * 2;
+  var2 = var2 / 4 + P4 * 65536;
+  var1 = ((P3 * var1 * var1) / 524288 + P2 * var1) / 524288;
+  var1 = (1 + var1 / 32768) * P1;
+  let pressure = 1048576 - rawP;
+  pressure = ((pressure - var2 / 4096) * 6250) / var1;
+  var1 = (P9 * pressure * pressure) / 2147483648;
+  var2 = (pressure * P8) / 32768;
+  pressure = (pressure + (var1 + var2 + P7) / 16) / 100;
+
+  let h = tFine - 76800;
+  h = (rawH - (H4 * 64 + (H5 / 16384) * h)) *
+    ((H2 / 65536) * (1 + (H6 / 67108864) * h * (1 + (H3 / 67108864) * h)));
+  h = h * (1 - (H1 * h) / 524288);
+  const humidity = Math.max(0, Math.min(100, h));
+
+  return [temperature, humidity, pressure];
+}
+
+/** Run the helper's compensate() on each [rawP, rawT, rawH] sample */
+function compensateHelper(cal: Calibration, samples: number[][]): number[][] {
+  const script = `
+import json, sys
+import read_bme280 as b
+
+data = json.load(sys.stdin)
+consts = b.kernel_constants(data["cal"])
+cal = b.np.array(consts, dtype=b.np.int64) if b.np is not None else consts
+out = []
+for raw_p, raw_t, raw_h in data["samples"]:
+    t, p, h = b.compensate(raw_p, raw_t, raw_h, cal)
+    out.append([t * b._TEMP_SCALE, h * b._HUMIDITY_SCALE, p * b._PRESSURE_SCALE])
+print(json.dumps(out))
+`;
+  const stdout = execFileSync("python3", ["-c", script], {
+    cwd: getHelpersDir(),
+    input: JSON.stringify({ cal, samples }),
+    encoding: "utf8",
+  });
+  return JSON.parse(stdout) as number[][];
+}
+
+describe.skipIf(!hasPython())("BME280 integer compensation", () => {
+  it("matches the datasheet float formulas to within one output LSB", () => {
+    const random = prng(1);
+    const between = (lo: number, hi: number) => lo + Math.floor(random() * (hi - lo));
+    const samples = Array.from({ length: SAMPLES }, () => [
+      between(250000, 500000), // raw pressure
+      between(400000, 600000), // raw temperature
+      between(10000, 50000),   // raw humidity
+    ]);
+
+    const results = compensateHelper(CAL, samples);
+    expect(results).toHaveLength(SAMPLES);
+
+    // Output resolution of each reading: °C, %RH, hPa
+    const lsb = [0.1, 0.1, 0.01];
+    const decimals = [1, 1, 2];
+    const round = (value: number, places: number) => Number(value.toFixed(places));
+
+    samples.forEach(([rawP, rawT, rawH], i) => {
+      const expected = compensateFloat(CAL, rawP, rawT, rawH);
+      for (let k = 0; k < 3; k++) {
+        const diff = Math.abs(round(results[i][k], decimals[k]) - round(expected[k], decimals[k]));
+        expect(diff).toBeLessThanOrEqual(lsb[k] + 1e-9);
+      }
+    });
+  });
+});
@@ -0,0 +1,310 @@
+import { describe, it, expect, vi, beforeEach, afterEach } from "vitest";
+import { EventEmitter } from "node:events";
+
+// ---------------------------------------------------------------------------
+// Mocks — must be declared before importing the module under test
+// ---------------------------------------------------------------------------
+
+// Mock node:child_process (spawn starts the sensor hub daemon)
+vi.mock("node:child_process", () => ({
+  execFile: vi.fn(),
+  spawn: vi.fn(),
+}));
+
+// ---------------------------------------------------------------------------
+// Imports (after mocks)
+// ---------------------------------------------------------------------------
+import { spawn } from "node:child_process";
+import { runSensorHub, stopPythonDaemon } from "../../src/sensors/exec-helper.js";
+
+const mockedSpawn = vi.mocked(spawn);
+
+// ---------------------------------------------------------------------------
+// Helpers
+// ---------------------------------------------------------------------------
+
+interface SentRequest {
+  id: number;
+  request: { sensor: string; args: string[] };
+}
+
+/** Stand-in for the python3 sensor_hub.py --daemon child process. */
+class FakeDaemon extends EventEmitter {
+  sent: SentRequest[] = [];
+  stdin = Object.assign(new EventEmitter(), {
+    write: vi.fn((line: string) => {
+      this.sent.push(JSON.parse(line) as SentRequest);
+      return true;
+    }),
+    unref: vi.fn(),
+  });
+  stdout = Object.assign(new EventEmitter(), {
+    setEncoding: vi.fn(),
+    unref: vi.fn(),
+  });
+  unref = vi.fn();
+  kill = vi.fn(() => {
+    this.emit("exit", null, "SIGTERM");
+    return true;
+  });
+
+  /** Write one line to the daemon's stdout */
+  reply(message: unknown): void {
+    this.stdout.emit("data", JSON.stringify(message) + "\n");
+  }
+
+  ready(): void {
+    this.reply({ ready: true });
+  }
+}
+
+let daemons: FakeDaemon[] = [];
+
+/** Let pending promise callbacks (and due fake timers) run */
+function flush(ms = 0): Promise<void> {
+  return vi.advanceTimersByTimeAsync(ms);
+}
+
+/** Start the hub and answer one request per sensor, so none is on its first use */
+async function startHub(...sensors: string[]): Promise<FakeDaemon> {
+  const warmups = sensors.map((sensor) => request(sensor));
+  await flush();
+  const daemon = daemons[daemons.length - 1];
+  daemon.ready();
+  await flush();
+  for (const sent of daemon.sent) daemon.reply({ id: sent.id, result: {} });
+  await Promise.all(warmups);
+  daemon.sent = [];
+  return daemon;
+}
+
+/** Start a hub request and return its settled outcome, without awaiting it */
+function request(sensor: string, timeoutMs?: number) {
+  return runSensorHub<Record<string, unknown>>(sensor, ["1"], timeoutMs).then(
+    (value) => ({ value }),
+    (error: Error) => ({ error: error.message }),
+  );
+}
+
+// ---------------------------------------------------------------------------
+// Tests
+// ---------------------------------------------------------------------------
+
+describe("runSensorHub", () => {
+  beforeEach(() => {
+    vi.clearAllMocks();
+    vi.useFakeTimers();
+    daemons = [];
+    mockedSpawn.mockImplementation(() => {
+      const daemon = new FakeDaemon();
+      daemons.push(daemon);
+      return daemon as unknown as ReturnType<typeof spawn>;
+    });
+  });
+
+  afterEach(() => {
+    stopPythonDaemon("sensor_hub.py");
+    vi.useRealTimers();
+  });
+
+  // -----------------------------------------------------------------------
+  // startup
+  // -----------------------------------------------------------------------
+  describe("startup", () => {
+    it("spawns the hub once in daemon mode and shares it between sensors", async () => {
+      const a = request("bme280");
+      const b = request("bh1750");
+      await flush();
+
+      expect(mockedSpawn).toHaveBeenCalledTimes(1);
+      const [cmd, args] = mockedSpawn.mock.calls[0];
+      expect(cmd).toBe("python3");
+      expect(args).toEqual([expect.stringMatching(/sensor_hub\.py$/), "--daemon"]);
+
+      daemons[0].ready();
+      await flush();
+      const [reqA, reqB] = daemons[0].sent;
+      daemons[0].reply({ id: reqA.id, result: { temperature: 22.5 } });
+      daemons[0].reply({ id: reqB.id, result: { lux: 300 } });
+
+      expect(await a).toEqual({ value: { temperature: 22.5 } });
+      expect(await b).toEqual({ value: { lux: 300 } });
+    });
+
+    it("does not send requests or start their timeout before the hub is ready", async () => {
+      const pending = request("bme280", 100);
+      await flush(5000); // interpreter still starting
+
+      expect(daemons[0].sent).toHaveLength(0);
+
+      daemons[0].ready();
+      await flush();
+      expect(daemons[0].sent).toHaveLength(1);
+      daemons[0].reply({ id: daemons[0].sent[0].id, result: { temperature: 21 } });
+
+      expect(await pending).toEqual({ value: { temperature: 21 } });
+    });
+
+    it("rejects and kills a hub that never becomes ready", async () => {
+      const pending = request("bme280");
+      await flush(10000);
+
+      expect(await pending).toEqual({ error: expect.stringContaining("did not start") });
+      expect(daemons[0].kill).toHaveBeenCalled();
+    });
+  });
+
+  // -----------------------------------------------------------------------
+  // replies
+  // -----------------------------------------------------------------------
+  describe("replies", () => {
+    it("matches replies to requests by id, not by order", async () => {
+      const a = request("hcsr04");
+      const b = request("touch");
+      await flush();
+      daemons[0].ready();
+      await flush();
+
+      const [reqA, reqB] = daemons[0].sent;
+      expect(reqA.request).toEqual({ sensor: "hcsr04", args: ["1"] });
+      expect(reqB.request).toEqual({ sensor: "touch", args: ["1"] });
+
+      // Answered in reverse order
+      daemons[0].reply({ id: reqB.id, result: { channels: [0] } });
+      daemons[0].reply({ id: reqA.id, result: { distanceCm: 42 } });
+
+      expect(await a).toEqual({ value: { distanceCm: 42 } });
+      expect(await b).toEqual({ value: { channels: [0] } });
+    });
+
+    it("turns an error reply into a rejection and keeps the hub running", async () => {
+      const failing = request("dht22");
+      await flush();
+      daemons[0].ready();
+      await flush();
+      daemons[0].reply({ id: daemons[0].sent[0].id, error: "checksum mismatch" });
+
+      expect(await failing).toEqual({ error: "sensor_hub.py failed: checksum mismatch" });
+      expect(daemons[0].kill).not.toHaveBeenCalled();
+
+      const next = request("dht22");
+      await flush();
+      daemons[0].reply({ id: daemons[0].sent[1].id, result: { temperature: 20 } });
+      expect(await next).toEqual({ value: { temperature: 20 } });
+      expect(mockedSpawn).toHaveBeenCalledTimes(1);
+    });
+
+    it("handles replies split across stdout chunks", async () => {
+      const pending = request("bh1750");
+      await flush();
+      daemons[0].ready();
+      await flush();
+
+      const line = JSON.stringify({ id: daemons[0].sent[0].id, result: { lux: 12.5 } }) + "\n";
+      daemons[0].stdout.emit("data", line.slice(0, 10));
+      daemons[0].stdout.emit("data", line.slice(10));
+
+      expect(await pending).toEqual({ value: { lux: 12.5 } });
+    });
+  });
+
+  // -----------------------------------------------------------------------
+  // timeouts and recovery
+  // -----------------------------------------------------------------------
+  describe("timeouts and recovery", () => {
+    it("times out one request without killing the hub or its other requests", async () => {
+      await startHub("dht22", "bme280");
+      const slow = request("dht22", 100);
+      const other = request("bme280", 5000);
+      await flush();
+      const [reqSlow, reqOther] = daemons[0].sent;
+
+      await flush(100);
+      expect(await slow).toEqual({ error: "sensor_hub.py timed out after 100ms" });
+      expect(daemons[0].kill).not.toHaveBeenCalled();
+
+      // The late reply is dropped; the other request still gets its own
+      daemons[0].reply({ id: reqSlow.id, result: { temperature: 99 } });
+      daemons[0].reply({ id: reqOther.id, result: { temperature: 22 } });
+      expect(await other).toEqual({ value: { temperature: 22 } });
+      expect(mockedSpawn).toHaveBeenCalledTimes(1);
+    });
+
+    it("kills and respawns a hub that stops answering", async () => {
+      await startHub("bme280");
+
+      // Every request times out; the hub is killed once it has been silent for 30 s
+      for (let i = 0; i < 6; i++) {
+        expect(daemons[0].kill).not.toHaveBeenCalled();
+        const pending = request("bme280");
+        await flush();
+        await flush(5000);
+        expect(await pending).toEqual({ error: "sensor_hub.py timed out after 5000ms" });
+      }
+      expect(daemons[0].kill).toHaveBeenCalledTimes(1);
+
+      const next = request("bme280");
+      await flush();
+      expect(mockedSpawn).toHaveBeenCalledTimes(2);
+      daemons[1].ready();
+      await flush();
+      daemons[1].reply({ id: daemons[1].sent[0].id, result: { temperature: 23 } });
+      expect(await next).toEqual({ value: { temperature: 23 } });
+    });
+
+    it("gives a sensor's first request the first-read timeout", async () => {
+      const first = request("bme280", 100);
+      await flush();
+      daemons[0].ready();
+      await flush(100);
+      const [reqFirst] = daemons[0].sent;
+
+      // Still waiting: the hub is importing the BME280 helper and numba
+      daemons[0].reply({ id: reqFirst.id, result: { temperature: 22 } });
+      expect(await first).toEqual({ value: { temperature: 22 } });
+
+      // Later requests get the caller's own timeout
+      const next = request("bme280", 100);
+      await flush();
+      await flush(100);
+      expect(await next).toEqual({ error: "sensor_hub.py timed out after 100ms" });
+    });
+
+    it("does not kill the hub as stalled while a first request is loading", async () => {
+      await startHub("bh1750");
+      const loading = request("bme280");
+      await flush();
+      const [reqLoading] = daemons[0].sent;
+
+      // Requests queued behind the first BME280 read keep timing out
+      for (let i = 0; i < 8; i++) {
+        const pending = request("bh1750");
+        await flush();
+        await flush(5000);
+        expect(await pending).toEqual({ error: "sensor_hub.py timed out after 5000ms" });
+      }
+      expect(daemons[0].kill).not.toHaveBeenCalled();
+
+      daemons[0].reply({ id: reqLoading.id, result: { temperature: 21 } });
+      expect(await loading).toEqual({ value: { temperature: 21 } });
+    });
+
+    it("rejects pending requests when the hub exits, then respawns it", async () => {
+      const pending = request("touch");
+      await flush();
+      daemons[0].ready();
+      await flush();
+
+      daemons[0].emit("exit", 1, null);
+      expect(await pending).toEqual({ error: "sensor_hub.py exited (1)" });
+
+      const next = request("touch");
+      await flush();
+      expect(mockedSpawn).toHaveBeenCalledTimes(2);
+      daemons[1].ready();
+      await flush();
+      daemons[1].reply({ id: daemons[1].sent[0].id, result: { channels: [] } });
+      expect(await next).toEqual({ value: { channels: [] } });
+    });
+  });
+});
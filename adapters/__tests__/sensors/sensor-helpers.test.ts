@@ -0,0 +1,230 @@
+import { describe, it, expect } from "vitest";
+import { execFileSync } from "node:child_process";
+import { getHelpersDir } from "../../src/sensors/exec-helper.js";
+
+// ---------------------------------------------------------------------------
+// The Python side of the sensor hub: the daemon protocol of sensor_hub.py,
+// its reading cache, and the pure decoders of the DHT22 and MPR121 helpers.
+// exec-helper.test.ts covers the TS side against a fake process.
+//
+// Runs the real helpers through python3; skipped where python3 is missing.
+// ---------------------------------------------------------------------------
+
+function hasPython(): boolean {
+  try {
+    execFileSync("python3", ["--version"], { stdio: "ignore" });
+    return true;
+  } catch {
+    return false;
+  }
+}
+
+/** Run python3 in the helpers directory with `input` on stdin; returns stdout */
+function python(args: string[], input = ""): string {
+  return execFileSync("python3", args, {
+    cwd: getHelpersDir(),
+    input,
+    encoding: "utf8",
+  });
+}
+
+/** Send request lines to a daemon and return its parsed reply lines */
+function converse(args: string[], requests: unknown[]): unknown[] {
+  const input = requests.map((r) => (typeof r === "string" ? r : JSON.stringify(r)) + "\n").join("");
+  return python(args, input).trim().split("\n").map((line) => JSON.parse(line) as unknown);
+}
+
+/** Run a snippet that reads JSON cases from stdin and prints JSON results */
+function evaluate(script: string, cases: unknown): unknown {
+  return JSON.parse(python(["-c", script], JSON.stringify(cases)));
+}
+
+// A hub whose READERS include a fake sensor: read("ok") returns how many
+// reads it has made, read("fail") raises. The hub's clock advances 1 s per
+// lookup, so cache ages are exact.
+const FAKE_HUB = `
+import sys, types, itertools
+import sensor_hub
+from sensor_daemon import SensorError
+
+calls = 0
+
+def read(mode):
+    global calls
+    calls += 1
+    if mode == "fail":
+        raise SensorError(f"boom {calls}")
+    return {"reads": calls}
+
+fake = types.ModuleType("read_fake")
+fake.parse_args = lambda args: tuple(args)
+fake.read = read
+sys.modules["read_fake"] = fake
+sensor_hub.READERS["fake"] = "read_fake"
+sensor_hub.CACHE_TTL["fake"] = 60
+
+clock = itertools.count(1)
+sensor_hub.time = types.SimpleNamespace(monotonic=lambda: next(clock))
+
+sys.argv = ["sensor_hub.py", "--daemon"]
+sensor_hub.main()
+`;
+
+/** Encode DHT22 data bytes as the high-pulse widths read_pigpio() records (µs) */
+function dhtPulses(bytes: number[]): number[] {
+  const pulses = [80]; // the sensor's response pulse, before the data bits
+  for (const byte of bytes) {
+    for (let bit = 7; bit >= 0; bit--) pulses.push((byte >> bit) & 1 ? 70 : 27);
+  }
+  return pulses;
+}
+
+function withChecksum(bytes: number[]): number[] {
+  return [...bytes, bytes.reduce((a, b) => a + b, 0) & 0xff];
+}
+
+describe.skipIf(!hasPython())("sensor helpers (python3)", () => {
+  // -----------------------------------------------------------------------
+  // sensor_hub.py --daemon
+  // -----------------------------------------------------------------------
+  describe("sensor hub daemon", () => {
+    it("reports ready, echoes ids and answers bare requests bare", () => {
+      const replies = converse(["sensor_hub.py", "--daemon"], [
+        { id: 7, request: { sensor: "nope", args: [] } },
+        { sensor: "nope", args: [] },
+        "",
+        "not json",
+        { id: 8, request: { sensor: "nope" } },
+      ]);
+
+      expect(replies).toEqual([
+        { ready: true },
+        { id: 7, error: "Unknown sensor: nope" },
+        { error: "Unknown sensor: nope" },
+        { error: expect.any(String) },
+        { id: 8, error: "Unknown sensor: nope" },
+      ]);
+    });
+
+    it("wraps readings and helper errors in the request's envelope", () => {
+      const replies = converse(["-c", FAKE_HUB], [
+        { id: 1, request: { sensor: "fake", args: ["ok"] } },
+        { id: 2, request: { sensor: "fake", args: ["fail"] } },
+        { sensor: "fake", args: ["ok"], ttl: 0 },
+      ]);
+
+      expect(replies).toEqual([
+        { ready: true },
+        { id: 1, result: { reads: 1 } },
+        { id: 2, error: "boom 2" },
+        { reads: 3 },
+      ]);
+    });
+  });
+
+  // -----------------------------------------------------------------------
+  // reading cache
+  // -----------------------------------------------------------------------
+  describe("reading cache", () => {
+    it("serves fresh readings from memory and re-reads stale or ttl: 0 ones", () => {
+      const replies = converse(["-c", FAKE_HUB], [
+        { id: 1, request: { sensor: "fake", args: ["ok"] } },
+        { id: 2, request: { sensor: "fake", args: ["ok"] } },           // within CACHE_TTL
+        { id: 3, request: { sensor: "fake", args: ["ok"], ttl: 0 } },   // forced
+        { id: 4, request: { sensor: "fake", args: ["ok"], ttl: 0.5 } }, // 1 s old: stale
+        { id: 5, request: { sensor: "fake", args: ["ok"], ttl: 60 } },
+      ]);
+
+      expect(replies.slice(1)).toEqual([
+        { id: 1, result: { reads: 1 } },
+        { id: 2, result: { reads: 1 } },
+        { id: 3, result: { reads: 2 } },
+        { id: 4, result: { reads: 3 } },
+        { id: 5, result: { reads: 3 } },
+      ]);
+    });
+
+    it("does not cache errors", () => {
+      const replies = converse(["-c", FAKE_HUB], [
+        { id: 1, request: { sensor: "fake", args: ["fail"] } },
+        { id: 2, request: { sensor: "fake", args: ["fail"] } },
+      ]);
+
+      expect(replies.slice(1)).toEqual([
+        { id: 1, error: "boom 1" },
+        { id: 2, error: "boom 2" },
+      ]);
+    });
+  });
+
+  // -----------------------------------------------------------------------
+  // read_dht22.decode()
+  // -----------------------------------------------------------------------
+  describe("DHT22 decode", () => {
+    const decode = (cases: number[][]) => evaluate(`
+import json, sys
+import read_dht22
+
+out = []
+for pulses in json.load(sys.stdin):
+    try:
+        out.append(read_dht22.decode(pulses))
+    except read_dht22.SensorError as e:
+        out.append({"error": str(e)})
+print(json.dumps(out))
+`, cases);
+
+    it("decodes humidity and temperature from the last 40 pulses", () => {
+      // 65.2 %RH = 0x028C, 23.1 °C = 0x00E7
+      expect(decode([dhtPulses(withChecksum([0x02, 0x8c, 0x00, 0xe7]))])).toEqual([
+        { temperature: 23.1, humidity: 65.2 },
+      ]);
+    });
+
+    it("applies the sign bit to the temperature", () => {
+      // -10.1 °C = 0x8065
+      expect(decode([dhtPulses(withChecksum([0x01, 0xf4, 0x80, 0x65]))])).toEqual([
+        { temperature: -10.1, humidity: 50 },
+      ]);
+    });
+
+    it("rejects a checksum mismatch and a short pulse train", () => {
+      const corrupt = withChecksum([0x02, 0x8c, 0x00, 0xe7]);
+      corrupt[4] ^= 0x01;
+      expect(decode([dhtPulses(corrupt), dhtPulses([0x02, 0x8c]).slice(0, 20)])).toEqual([
+        { error: "checksum mismatch" },
+        { error: "null reading" },
+      ]);
+    });
+  });
+
+  // -----------------------------------------------------------------------
+  // read_touch.parse_mpr121()
+  // -----------------------------------------------------------------------
+  describe("MPR121 register parsing", () => {
+    const parse = (blocks: number[][]) => evaluate(`
+import json, sys
+import read_touch
+
+print(json.dumps([read_touch.parse_mpr121(regs) for regs in json.load(sys.stdin)]))
+`, blocks);
+
+    it("reports touched channels with their 10-bit filtered data", () => {
+      const regs = new Array<number>(28).fill(0);
+      regs[0] = 0x09;  // channels 0 and 3
+      regs[1] = 0x88;  // channel 11, plus the over-current flag (bit 7)
+      regs[4] = 0xff;  // channel 0: 0x1FF, upper bits of the high byte ignored
+      regs[5] = 0xfd;
+      regs[6] = 0x55;  // channel 1 is not touched: its data is not reported
+      regs[10] = 0x01; // channel 3: 0x201
+      regs[11] = 0x02;
+      regs[26] = 0xff; // channel 11: 0x3FF
+      regs[27] = 0x03;
+
+      expect(parse([regs, new Array<number>(28).fill(0)])).toEqual([
+        { channels: [0, 3, 11], values: [0x1ff, 0x201, 0x3ff] },
+        { channels: [], values: null },
+      ]);
+    });
+  });
+});
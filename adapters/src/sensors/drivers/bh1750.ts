@@ -7,7 +7,7 @@
 
 import type { SensorDriver, SensorDriverConfig, SensorDetectionResult } from "../../../../engine/src/perception/sensor-driver.js";
 import type { RawInput, ScalarSensorData } from "../../../../engine/src/perception/perception-types.js";
-import { pythonModuleExists, runPythonHelper, deviceExists } from "../exec-helper.js";
+import { pythonModuleExists, runSensorHub, deviceExists } from "../exec-helper.js";
 
 interface BH1750Reading {
   lux: number;
@@ -44,8 +44,8 @@ export function createBH1750Driver(
       }
 
       try {
-        const reading = await runPythonHelper<BH1750Reading>(
-          "read_bh1750.py",
+        const reading = await runSensorHub<BH1750Reading>(
+          "bh1750",
           [String(i2cBus), String(i2cAddress)],
         );
         if (reading && typeof reading.lux === "number") {
@@ -59,8 +59,8 @@ export function createBH1750Driver(
 
     async start(): Promise<void> {
       try {
-        const reading = await runPythonHelper<BH1750Reading>(
-          "read_bh1750.py",
+        const reading = await runSensorHub<BH1750Reading>(
+          "bh1750",
           [String(i2cBus), String(i2cAddress)],
         );
         if (reading) {
@@ -72,8 +72,8 @@ export function createBH1750Driver(
 
     async read(): Promise<RawInput | null> {
       try {
-        const reading = await runPythonHelper<BH1750Reading>(
-          "read_bh1750.py",
+        const reading = await runSensorHub<BH1750Reading>(
+          "bh1750",
           [String(i2cBus), String(i2cAddress)],
         );
         if (!reading) return null;
@@ -107,7 +107,7 @@ export function createBH1750Driver(
     },
 
     async stop(): Promise<void> {
-      // Nothing to release
+      // Nothing to release — the sensor hub is shared with other drivers
     },
   };
 }
@@ -7,7 +7,7 @@
 
 import type { SensorDriver, SensorDriverConfig, SensorDetectionResult } from "../../../../engine/src/perception/sensor-driver.js";
 import type { RawInput, ScalarSensorData } from "../../../../engine/src/perception/perception-types.js";
-import { pythonModuleExists, runPythonHelper, deviceExists } from "../exec-helper.js";
+import { pythonModuleExists, runSensorHub, deviceExists } from "../exec-helper.js";
 
 interface BME280Reading {
   temperature: number;
@@ -27,8 +27,8 @@ async function readBME280(i2cBus: number, i2cAddress: number): Promise<BME280Rea
   if (lastReading && now - lastReadTime < 1000) return lastReading;
 
   try {
-    const reading = await runPythonHelper<BME280Reading>(
-      "read_bme280.py",
+    const reading = await runSensorHub<BME280Reading>(
+      "bme280",
       [String(i2cBus), String(i2cAddress)],
     );
     lastReading = reading;
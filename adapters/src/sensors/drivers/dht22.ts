@@ -2,7 +2,8 @@
  * DHT22 Driver — Temperature and Humidity sensor.
  *
  * Common RPi sensor connected via GPIO.
- * Reads via Python helper using adafruit-circuitpython-dht.
+ * Reads via Python helper using pigpio (hardware-timed), falling back to
+ * adafruit-circuitpython-dht.
  *
  * Produces TWO modalities: temperature and humidity.
  * This driver is registered twice with different modality settings.
@@ -10,7 +11,7 @@
 
 import type { SensorDriver, SensorDriverConfig, SensorDetectionResult } from "../../../../engine/src/perception/sensor-driver.js";
 import type { RawInput, ScalarSensorData } from "../../../../engine/src/perception/perception-types.js";
-import { pythonModuleExists, runPythonHelper } from "../exec-helper.js";
+import { pythonModuleExists, runSensorHub } from "../exec-helper.js";
 
 interface DHT22Reading {
   temperature: number;
@@ -48,7 +49,7 @@ async function readDHT22(gpioPin: number): Promise<DHT22Reading | null> {
   }
 
   try {
-    const reading = await runPythonHelper<DHT22Reading>("read_dht22.py", [String(gpioPin)]);
+    const reading = await runSensorHub<DHT22Reading>("dht22", [String(gpioPin)]);
     lastReading = reading;
     lastReadTime = now;
     return reading;
@@ -76,9 +77,9 @@ export function createDHT22Driver(
     config: cfg,
 
     async detect(): Promise<SensorDetectionResult> {
-      const hasModule = await pythonModuleExists("adafruit_dht");
+      const hasModule = await pythonModuleExists("pigpio") || await pythonModuleExists("adafruit_dht");
       if (!hasModule) {
-        return { available: false, reason: "Python module adafruit_dht not found (pip install adafruit-circuitpython-dht)" };
+        return { available: false, reason: "Neither pigpio nor adafruit_dht found (pip install adafruit-circuitpython-dht)" };
       }
 
       // Try a test read
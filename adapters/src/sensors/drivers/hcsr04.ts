@@ -3,7 +3,7 @@
  *
  * Measures distance via ultrasonic pulse echo timing.
  * Connected to RPi GPIO (trigger + echo pins).
- * Reads via Python helper using RPi.GPIO.
+ * Reads via Python helper using pigpio (hardware-timed) or RPi.GPIO.
  *
  * Maps to the "proximity" modality.
  * The entity perceives nearby presence, not "distance measurement."
@@ -11,7 +11,7 @@
 
 import type { SensorDriver, SensorDriverConfig, SensorDetectionResult } from "../../../../engine/src/perception/sensor-driver.js";
 import type { RawInput, ProximitySensorData } from "../../../../engine/src/perception/perception-types.js";
-import { pythonModuleExists, runPythonHelper } from "../exec-helper.js";
+import { pythonModuleExists, runSensorHub } from "../exec-helper.js";
 
 interface HCSR04Reading {
   distanceCm: number;
@@ -41,19 +41,19 @@ export function createHCSR04Driver(
     config: cfg,
 
     async detect(): Promise<SensorDetectionResult> {
-      const hasGPIO = await pythonModuleExists("RPi.GPIO");
+      const hasGPIO = await pythonModuleExists("pigpio") || await pythonModuleExists("RPi.GPIO");
       if (!hasGPIO) {
         // Also try gpiozero
         const hasGpiozero = await pythonModuleExists("gpiozero");
         if (!hasGpiozero) {
-          return { available: false, reason: "Neither RPi.GPIO nor gpiozero found" };
+          return { available: false, reason: "None of pigpio, RPi.GPIO, or gpiozero found" };
         }
       }
 
       // Try a test reading
       try {
-        const reading = await runPythonHelper<HCSR04Reading>(
-          "read_hcsr04.py",
+        const reading = await runSensorHub<HCSR04Reading>(
+          "hcsr04",
           [String(triggerPin), String(echoPin)],
           5000,
         );
@@ -72,8 +72,8 @@ export function createHCSR04Driver(
 
     async read(): Promise<RawInput | null> {
       try {
-        const reading = await runPythonHelper<HCSR04Reading>(
-          "read_hcsr04.py",
+        const reading = await runSensorHub<HCSR04Reading>(
+          "hcsr04",
           [String(triggerPin), String(echoPin)],
           5000,
         );
@@ -11,7 +11,7 @@
 
 import type { SensorDriver, SensorDriverConfig, SensorDetectionResult } from "../../../../engine/src/perception/sensor-driver.js";
 import type { RawInput, TouchSensorData } from "../../../../engine/src/perception/perception-types.js";
-import { pythonModuleExists, runPythonHelper, deviceExists } from "../exec-helper.js";
+import { pythonModuleExists, runSensorHub, deviceExists } from "../exec-helper.js";
 
 interface TouchReading {
   /** Active touch channels (for MPR121: array of channel indices; for TTP223: [0] or []) */
@@ -90,7 +90,9 @@ export function createTouchDriver(
 
     async detect(): Promise<SensorDetectionResult> {
       if (sensorType === "ttp223") {
-        const hasGPIO = await pythonModuleExists("RPi.GPIO") || await pythonModuleExists("gpiozero");
+        const hasGPIO = await pythonModuleExists("gpiod")
+          || await pythonModuleExists("RPi.GPIO")
+          || await pythonModuleExists("gpiozero");
         if (!hasGPIO) {
           return { available: false, reason: "No GPIO library found" };
         }
@@ -102,14 +104,9 @@ export function createTouchDriver(
         return { available: false, reason: `I2C bus /dev/i2c-${i2cBus} not found` };
       }
 
-      const hasLib = await pythonModuleExists("adafruit_mpr121");
-      if (!hasLib) {
-        return { available: false, reason: "adafruit_mpr121 not found (pip install adafruit-circuitpython-mpr121)" };
-      }
-
       try {
-        const reading = await runPythonHelper<TouchReading>(
-          "read_touch.py",
+        const reading = await runSensorHub<TouchReading>(
+          "touch",
           [sensorType, String(i2cBus), String(i2cAddress), String(gpioPin)],
         );
         if (reading) {
@@ -130,8 +127,8 @@ export function createTouchDriver(
 
     async read(): Promise<RawInput | null> {
       try {
-        const reading = await runPythonHelper<TouchReading>(
-          "read_touch.py",
+        const reading = await runSensorHub<TouchReading>(
+          "touch",
           [sensorType, String(i2cBus), String(i2cAddress), String(gpioPin)],
         );
         if (!reading) return null;
@@ -5,8 +5,9 @@
  * All calls have timeouts to prevent hanging.
  */
 
-import { execFile } from "node:child_process";
+import { execFile, spawn, type ChildProcess } from "node:child_process";
 import { access, constants } from "node:fs/promises";
+import type { Socket } from "node:net";
 import { resolve, dirname } from "node:path";
 import { fileURLToPath } from "node:url";
 
@@ -64,6 +65,234 @@ export async function runPythonHelper<T>(scriptName: string, args: string[] = []
   return JSON.parse(stdout) as T;
 }
 
+interface PendingRequest {
+  resolve: (result: unknown) => void;
+  reject: (err: Error) => void;
+  timer: ReturnType<typeof setTimeout>;
+  /** Set on a sensor's first request, which gets FIRST_READ_TIMEOUT_MS */
+  warmKey?: string;
+  deadline: number;
+}
+
+/** One reply line: {"id": n, "result": ...} or {"id": n, "error": "..."} */
+interface DaemonReply {
+  id?: unknown;
+  result?: unknown;
+  error?: unknown;
+  ready?: unknown;
+}
+
+interface PythonDaemon {
+  proc: ChildProcess;
+  buffer: string;
+  nextId: number;
+  /** In-flight requests by id; replies may arrive after their caller gave up */
+  pending: Map<number, PendingRequest>;
+  /** Resolves once the daemon has written its {"ready": true} line */
+  ready: Promise<void>;
+  isReady: boolean;
+  closed: boolean;
+  /** When the oldest unanswered timed-out request was sent, or null after any reply */
+  stalledSince: number | null;
+  /** Sensors that have answered at least once (their helper is imported) */
+  warmed: Set<string>;
+}
+
+/** Long-lived helper processes, keyed by script name */
+const daemons = new Map<string, PythonDaemon>();
+
+const SENSOR_HUB = "sensor_hub.py";
+
+/** Time allowed for the interpreter to start and report ready */
+const STARTUP_TIMEOUT_MS = 10000;
+
+/**
+ * Minimum timeout for a sensor's first request to a daemon. That request
+ * imports the sensor's helper and hardware libraries — for the BME280 also
+ * numba, which JIT-compiles the kernel before numba caches it on disk — so
+ * it is given longer than a steady-state reading, and the daemon is not
+ * treated as stalled while it runs.
+ */
+const FIRST_READ_TIMEOUT_MS = 60000;
+
+/**
+ * A timed-out request only rejects its own caller. The daemon is killed
+ * (and respawned on the next call) only once it has answered nothing for
+ * this long — one slow sensor must not cost every other sensor sharing
+ * the hub its pending reading and a cold restart.
+ */
+const STALL_MS = 30000;
+
+function parseReply(line: string): DaemonReply | null {
+  try {
+    const reply = JSON.parse(line) as DaemonReply;
+    return reply && typeof reply === "object" ? reply : null;
+  } catch {
+    return null;
+  }
+}
+
+function spawnDaemon(scriptName: string): PythonDaemon {
+  const scriptPath = resolve(HELPERS_DIR, scriptName);
+  const proc = spawn("python3", [scriptPath, "--daemon"], { stdio: ["pipe", "pipe", "ignore"] });
+
+  let markReady!: () => void;
+  let failStartup!: (err: Error) => void;
+  const ready = new Promise<void>((resolve, reject) => {
+    markReady = resolve;
+    failStartup = reject;
+  });
+  ready.catch(() => { /* surfaced to each waiting request */ });
+  const daemon: PythonDaemon = {
+    proc,
+    buffer: "",
+    nextId: 0,
+    pending: new Map(),
+    ready,
+    isReady: false,
+    closed: false,
+    stalledSince: null,
+    warmed: new Set(),
+  };
+
+  const fail = (err: Error) => {
+    daemon.closed = true;
+    clearTimeout(startupTimer);
+    failStartup(err);
+    if (daemons.get(scriptName) === daemon) daemons.delete(scriptName);
+    for (const req of daemon.pending.values()) {
+      clearTimeout(req.timer);
+      req.reject(err);
+    }
+    daemon.pending.clear();
+  };
+
+  const startupTimer = setTimeout(() => {
+    fail(new Error(`${scriptName} did not start within ${STARTUP_TIMEOUT_MS}ms`));
+    proc.kill();
+  }, STARTUP_TIMEOUT_MS);
+
+  proc.stdout!.setEncoding("utf8");
+  proc.stdout!.on("data", (chunk: string) => {
+    daemon.buffer += chunk;
+    let newline: number;
+    while ((newline = daemon.buffer.indexOf("\n")) >= 0) {
+      const reply = parseReply(daemon.buffer.slice(0, newline));
+      daemon.buffer = daemon.buffer.slice(newline + 1);
+      if (!reply) continue;
+
+      if (!daemon.isReady) {
+        // Lines before the ready marker are not replies
+        if (reply.ready === true) {
+          daemon.isReady = true;
+          clearTimeout(startupTimer);
+          markReady();
+        }
+        continue;
+      }
+
+      daemon.stalledSince = null;
+      const req = typeof reply.id === "number" ? daemon.pending.get(reply.id) : undefined;
+      if (!req) continue; // Late reply to a request that already timed out
+      daemon.pending.delete(reply.id as number);
+      clearTimeout(req.timer);
+      if (req.warmKey !== undefined) daemon.warmed.add(req.warmKey);
+      if (typeof reply.error === "string") {
+        req.reject(new Error(`${scriptName} failed: ${reply.error}`));
+      } else {
+        req.resolve(reply.result);
+      }
+    }
+  });
+  proc.stdin!.on("error", () => { /* surfaced via exit */ });
+  proc.on("error", (err) => fail(new Error(`${scriptName} failed: ${err.message}`)));
+  proc.on("exit", (code, signal) => fail(new Error(`${scriptName} exited (${signal ?? code})`)));
+
+  // Idle daemons must not keep the Node process alive
+  proc.unref();
+  (proc.stdin as Socket).unref();
+  (proc.stdout as Socket).unref();
+
+  daemons.set(scriptName, daemon);
+  return daemon;
+}
+
+/**
+ * Read a sensor through the shared sensor hub (helpers/sensor_hub.py).
+ *
+ * One persistent Python process serves every I2C/GPIO sensor, so hardware
+ * library imports and bus handles are shared instead of duplicated per
+ * sensor. `args` are the same arguments the sensor's read_<sensor>.py takes.
+ *
+ * Each call sends one JSON line and waits for the reply line with the same
+ * id. The timeout starts once the hub has reported ready, and a sensor's
+ * first request waits at least FIRST_READ_TIMEOUT_MS, since it loads that
+ * sensor's libraries in the hub. A timed-out call rejects on its own; a hub
+ * that stops answering altogether, or crashes, is killed and respawned on
+ * the next call.
+ */
+export function runSensorHub<T>(sensor: string, args: string[] = [], timeoutMs = 5000): Promise<T> {
+  return requestDaemon<T>(SENSOR_HUB, { sensor, args }, timeoutMs, sensor);
+}
+
+/** Latest deadline among in-flight first requests (0 if none) */
+function graceUntil(daemon: PythonDaemon): number {
+  let until = 0;
+  for (const req of daemon.pending.values()) {
+    if (req.warmKey !== undefined) until = Math.max(until, req.deadline);
+  }
+  return until;
+}
+
+function requestDaemon<T>(
+  scriptName: string,
+  request: unknown,
+  timeoutMs: number,
+  warmKey?: string,
+): Promise<T> {
+  const daemon = daemons.get(scriptName) ?? spawnDaemon(scriptName);
+
+  return daemon.ready.then(() => new Promise<T>((resolve, reject) => {
+    if (daemon.closed) {
+      reject(new Error(`${scriptName} exited`));
+      return;
+    }
+    const id = daemon.nextId++;
+    const sentAt = Date.now();
+    const firstUse = warmKey !== undefined && !daemon.warmed.has(warmKey);
+    const limitMs = firstUse ? Math.max(timeoutMs, FIRST_READ_TIMEOUT_MS) : timeoutMs;
+    const timer = setTimeout(() => {
+      daemon.pending.delete(id);
+      // A first request that ran out its grace counts as silence from now on
+      const now = Date.now();
+      daemon.stalledSince = Math.max(daemon.stalledSince ?? sentAt, firstUse ? now : 0);
+      if (now - Math.max(daemon.stalledSince, graceUntil(daemon)) >= STALL_MS) {
+        stopPythonDaemon(scriptName);
+      }
+      reject(new Error(`${scriptName} timed out after ${limitMs}ms`));
+    }, limitMs);
+    daemon.pending.set(id, {
+      resolve: resolve as (result: unknown) => void,
+      reject,
+      timer,
+      warmKey: firstUse ? warmKey : undefined,
+      deadline: sentAt + limitMs,
+    });
+    daemon.proc.stdin!.write(JSON.stringify({ id, request }) + "\n");
+  }));
+}
+
+/**
+ * Stop a persistent Python helper started by runSensorHub().
+ * Safe to call when no daemon is running.
+ */
+export function stopPythonDaemon(scriptName: string): void {
+  const daemon = daemons.get(scriptName);
+  if (!daemon) return;
+  daemons.delete(scriptName);
+  daemon.proc.kill();
+}
+
 /**
  * Check if a command exists on the system.
  */
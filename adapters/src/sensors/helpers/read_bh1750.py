@@ -3,34 +3,61 @@
 BH1750 Light Sensor Reader (I2C).
 
 Usage: python3 read_bh1750.py <i2c_bus> <i2c_address>
+       python3 read_bh1750.py --daemon
 Output: JSON {"lux": 342.5}
 
 Requires: pip install smbus2
 """
-import sys
-import json
 import time
+import struct
+
+from sensor_daemon import run, get_bus
+
+# Measurement result: one big-endian 16-bit count
+_RESULT = struct.Struct('>H')
+
+# (bus_num, address) pairs already switched to continuous measurement
+_continuous = set()
+
+def parse_args(args):
+    bus_num = int(args[0]) if len(args) > 0 else 1
+    address = int(args[1]) if len(args) > 1 else 0x23
+    return bus_num, address
+
+def start_continuous(bus, address):
+    """
+    Put the sensor in continuous high resolution mode (1 lux, 120ms cycle).
+    It then keeps measuring on its own, so only the first reading waits.
+    """
+    # Power on
+    bus.write_byte(address, 0x01)
+    # Continuous high resolution mode
+    bus.write_byte(address, 0x10)
+    time.sleep(0.18)  # Wait for first measurement
+
+def read(bus_num, address):
+    from smbus2 import i2c_msg
+
+    bus = get_bus(bus_num)
+    key = (bus_num, address)
+    if key not in _continuous:
+        start_continuous(bus, address)
+        _continuous.add(key)
+
+    # Plain 2-byte read: an SMBus block read would first send command 0x00,
+    # which is Power Down and would stop continuous measurement
+    data = i2c_msg.read(address, 2)
+    try:
+        bus.i2c_rdwr(data)
+    except OSError:
+        _continuous.discard(key)  # Sensor may have lost power; re-init next time
+        raise
+    lux = _RESULT.unpack_from(bytes(data))[0] / 1.2
 
-def main():
-    bus_num = int(sys.argv[1]) if len(sys.argv) > 1 else 1
-    address = int(sys.argv[2]) if len(sys.argv) > 2 else 0x23
-
-    import smbus2
+    return {"lux": round(lux, 1)}
 
-    bus = smbus2.SMBus(bus_num)
-    try:
-        # Power on
-        bus.write_byte(address, 0x01)
-        # One-time high resolution mode (1 lux resolution, 120ms)
-        bus.write_byte(address, 0x20)
-        time.sleep(0.18)  # Wait for measurement
-
-        data = bus.read_i2c_block_data(address, 0x00, 2)
-        lux = (data[0] << 8 | data[1]) / 1.2
-
-        print(json.dumps({"lux": round(lux, 1)}))
-    finally:
-        bus.close()
+def main():
+    run(read, parse_args)
 
 if __name__ == "__main__":
     main()
@@ -3,48 +3,126 @@
 DHT22 Temperature & Humidity Sensor Reader.
 
 Usage: python3 read_dht22.py <gpio_pin>
+       python3 read_dht22.py --daemon
 Output: JSON {"temperature": 22.5, "humidity": 45.2}
 
-Requires: pip install adafruit-circuitpython-dht
-          sudo apt install libgpiod2
+Requires: sudo apt install pigpio python3-pigpio && sudo systemctl enable --now pigpiod
+          (or, without pigpiod: pip install adafruit-circuitpython-dht
+                                sudo apt install libgpiod2)
 """
-import sys
-import json
+import time
+import atexit
+import threading
 
-def main():
-    gpio_pin = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+from sensor_daemon import run, get_pigpio, drop_pigpio, SensorError
 
-    import board
-    import adafruit_dht
+# Open adafruit_dht handles, keyed by GPIO pin (reused across daemon requests)
+_sensors = {}
+
+def parse_args(args):
+    gpio_pin = int(args[0]) if len(args) > 0 else 4
+    return (gpio_pin,)
+
+def decode(high_pulses_us):
+    """Decode the sensor's 40 data bits from the widths of its high pulses."""
+    if len(high_pulses_us) < 40:
+        raise SensorError("null reading")
+
+    # 0 is a ~27us high pulse, 1 is ~70us. The data bits are the last 40;
+    # earlier pulses are the line release and the sensor's 80us response.
+    bits = [1 if width > 50 else 0 for width in high_pulses_us[-40:]]
+    data = [0] * 5
+    for i, bit in enumerate(bits):
+        data[i // 8] = (data[i // 8] << 1) | bit
+
+    if (data[0] + data[1] + data[2] + data[3]) & 0xFF != data[4]:
+        raise SensorError("checksum mismatch")
 
-    # Map GPIO number to board pin
-    pin_map = {
-        4: board.D4, 5: board.D5, 6: board.D6, 12: board.D12,
-        13: board.D13, 16: board.D16, 17: board.D17, 18: board.D18,
-        19: board.D19, 20: board.D20, 21: board.D21, 22: board.D22,
-        23: board.D23, 24: board.D24, 25: board.D25, 26: board.D26,
-        27: board.D27,
+    humidity = ((data[0] << 8) | data[1]) / 10
+    temperature = (((data[2] & 0x7F) << 8) | data[3]) / 10
+    if data[2] & 0x80:
+        temperature = -temperature
+
+    return {
+        "temperature": round(temperature, 1),
+        "humidity": round(humidity, 1),
     }
 
-    pin = pin_map.get(gpio_pin)
-    if pin is None:
-        print(json.dumps({"error": f"Unsupported GPIO pin: {gpio_pin}"}), file=sys.stderr)
-        sys.exit(1)
+def read_pigpio(pi, gpio_pin):
+    """Read via pigpiod, which timestamps every edge (5us default sample rate)."""
+    import pigpio
+
+    high_pulses = []
+    rise = {}
+    done = threading.Event()
 
-    sensor = adafruit_dht.DHT22(pin)
+    def on_edge(gpio, level, tick):
+        if level == 1:
+            rise["tick"] = tick
+        elif level == 0 and "tick" in rise:
+            high_pulses.append(pigpio.tickDiff(rise.pop("tick"), tick))
+            # Line release + 80us response + 40 data bits
+            if len(high_pulses) >= 42:
+                done.set()
+
+    cb = pi.callback(gpio_pin, pigpio.EITHER_EDGE, on_edge)
     try:
-        temperature = sensor.temperature
-        humidity = sensor.humidity
-        if temperature is not None and humidity is not None:
-            print(json.dumps({
-                "temperature": round(temperature, 1),
-                "humidity": round(humidity, 1),
-            }))
-        else:
-            print(json.dumps({"error": "null reading"}), file=sys.stderr)
-            sys.exit(1)
+        # Start signal: DHT22 needs the line held low for at least 1ms
+        pi.write(gpio_pin, 0)
+        time.sleep(0.001)
+        pi.set_mode(gpio_pin, pigpio.INPUT)
+        # Response + 40 bits take ~5ms; the rest is slack for the callback
+        # thread to deliver edges late under load
+        done.wait(0.05)
     finally:
+        cb.cancel()
+
+    return decode(high_pulses)
+
+def close_sensors():
+    for sensor in _sensors.values():
         sensor.exit()
 
+def get_sensor(gpio_pin):
+    sensor = _sensors.get(gpio_pin)
+    if sensor is not None:
+        return sensor
+
+    import board
+    import adafruit_dht
+
+    # Resolve only the one board pin needed (board.D<n>)
+    pin = getattr(board, f"D{gpio_pin}", None)
+    if pin is None:
+        raise SensorError(f"Unsupported GPIO pin: {gpio_pin}")
+
+    if not _sensors:
+        atexit.register(close_sensors)
+    sensor = _sensors[gpio_pin] = adafruit_dht.DHT22(pin)
+    return sensor
+
+def read(gpio_pin):
+    pi = get_pigpio()
+    if pi is not None:
+        try:
+            return read_pigpio(pi, gpio_pin)
+        except OSError:
+            drop_pigpio()  # pigpiod went away; reconnect on the next read
+            raise
+
+    sensor = get_sensor(gpio_pin)
+    temperature = sensor.temperature
+    humidity = sensor.humidity
+    if temperature is None or humidity is None:
+        raise SensorError("null reading")
+
+    return {
+        "temperature": round(temperature, 1),
+        "humidity": round(humidity, 1),
+    }
+
+def main():
+    run(read, parse_args)
+
 if __name__ == "__main__":
     main()
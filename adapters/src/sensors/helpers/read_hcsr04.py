@@ -3,69 +3,161 @@
 HC-SR04 Ultrasonic Distance Sensor Reader.
 
 Usage: python3 read_hcsr04.py <trigger_pin> <echo_pin>
+       python3 read_hcsr04.py --daemon
 Output: JSON {"distanceCm": 42.3}
 
 Requires: pip install RPi.GPIO (or gpiozero)
+Optional: sudo apt install pigpio python3-pigpio && sudo systemctl enable --now pigpiod
+          (echo timed by pigpiod, to its 5 µs default sample rate, instead of a Python loop)
 """
-import sys
-import json
 import time
+import threading
 
-def main():
-    trigger_pin = int(sys.argv[1]) if len(sys.argv) > 1 else 23
-    echo_pin = int(sys.argv[2]) if len(sys.argv) > 2 else 24
+from sensor_daemon import run, get_gpio, get_pigpio, drop_pigpio, SensorError
 
-    try:
-        import RPi.GPIO as GPIO
+# Monotonic integer clock for the polling loops — no float allocation per
+# call, and a global lookup instead of an attribute lookup on `time`
+_pc = time.perf_counter_ns
+
+# Longest echo pulse accepted: the 400cm round trip is ~24ms. A sensor with
+# nothing in range holds echo high for ~38ms, which both read paths report
+# as 999 (no echo) rather than clamping it to 400.
+MAX_ECHO_NS = 25_000_000
+
+# Fallbacks when pigpiod is not running: (trigger_pin, echo_pin) pairs
+# configured through RPi.GPIO, or gpiozero sensors if RPi.GPIO is missing.
+# Both are reused across daemon requests.
+_configured = set()
+_zero_sensors = {}
 
-        GPIO.setmode(GPIO.BCM)
-        GPIO.setwarnings(False)
+# (pi, trigger_pin, echo_pin) already configured through pigpiod; a new
+# connection (e.g. after pigpiod restarted) configures the pins again
+_pigpio_configured = set()
+
+def parse_args(args):
+    trigger_pin = int(args[0]) if len(args) > 0 else 23
+    echo_pin = int(args[1]) if len(args) > 1 else 24
+    return trigger_pin, echo_pin
+
+def setup(trigger_pin, echo_pin):
+    """Configure the pins once. Returns the RPi.GPIO module, or None if unavailable."""
+    GPIO = get_gpio()
+    key = (trigger_pin, echo_pin)
+    if GPIO is not None and key not in _configured:
         GPIO.setup(trigger_pin, GPIO.OUT)
         GPIO.setup(echo_pin, GPIO.IN)
+        _configured.add(key)
+    return GPIO
 
-        # Send 10us trigger pulse
-        GPIO.output(trigger_pin, False)
-        time.sleep(0.002)
-        GPIO.output(trigger_pin, True)
-        time.sleep(0.00001)
-        GPIO.output(trigger_pin, False)
-
-        # Wait for echo
-        timeout = time.time() + 0.1  # 100ms timeout
-        pulse_start = time.time()
-        while GPIO.input(echo_pin) == 0:
-            pulse_start = time.time()
-            if pulse_start > timeout:
-                print(json.dumps({"distanceCm": 999}))
-                return
-
-        pulse_end = time.time()
-        timeout = time.time() + 0.1
-        while GPIO.input(echo_pin) == 1:
-            pulse_end = time.time()
-            if pulse_end > timeout:
-                print(json.dumps({"distanceCm": 999}))
-                return
-
-        # Calculate distance
-        pulse_duration = pulse_end - pulse_start
-        distance = pulse_duration * 17150  # Speed of sound / 2
-        distance = round(distance, 1)
-
-        # Clamp to reasonable range
-        distance = max(2, min(400, distance))
-
-        print(json.dumps({"distanceCm": distance}))
-
-    except ImportError:
-        # Fallback to gpiozero
+def read_gpiozero(trigger_pin, echo_pin):
+    """Fallback to gpiozero when RPi.GPIO is not installed."""
+    key = (trigger_pin, echo_pin)
+    sensor = _zero_sensors.get(key)
+    if sensor is None:
         from gpiozero import DistanceSensor
+        sensor = _zero_sensors[key] = DistanceSensor(
+            echo=echo_pin, trigger=trigger_pin, max_distance=4)
+
+    distance = sensor.distance * 100  # meters to cm
+    return {"distanceCm": round(distance, 1)}
+
+def to_distance(pulse_seconds):
+    distance = pulse_seconds * 17150  # Speed of sound / 2
+    distance = round(distance, 1)
+
+    # Clamp to reasonable range
+    return max(2, min(400, distance))
+
+def read_pigpio(pi, trigger_pin, echo_pin):
+    """Time the echo pulse from edge ticks recorded by pigpiod."""
+    import pigpio
+
+    key = (pi, trigger_pin, echo_pin)
+    if key not in _pigpio_configured:
+        pi.set_mode(trigger_pin, pigpio.OUTPUT)
+        pi.set_mode(echo_pin, pigpio.INPUT)
+        pi.write(trigger_pin, 0)
+        _pigpio_configured.add(key)
+
+    # Same check as the RPi.GPIO path: echo must idle low before a trigger
+    if pi.read(echo_pin) == 1:
+        raise SensorError("Echo pin already high before trigger")
+
+    ticks = {}
+    done = threading.Event()
 
-        sensor = DistanceSensor(echo=echo_pin, trigger=trigger_pin, max_distance=4)
-        distance = sensor.distance * 100  # meters to cm
-        sensor.close()
+    def on_edge(gpio, level, tick):
+        if level == 1:
+            ticks["start"] = tick
+        elif level == 0 and "start" in ticks:
+            ticks["end"] = tick
+            done.set()
 
-        print(json.dumps({"distanceCm": round(distance, 1)}))
+    cb = pi.callback(echo_pin, pigpio.EITHER_EDGE, on_edge)
+    try:
+        pi.gpio_trigger(trigger_pin, 10, 1)  # 10us trigger pulse
+        # Longest accepted echo, plus the sensor's burst delay and slack for
+        # the callback thread
+        done.wait(MAX_ECHO_NS / 1e9 + 0.005)
+    finally:
+        cb.cancel()
+
+    if "end" not in ticks:
+        return {"distanceCm": 999}
+
+    pulse_us = pigpio.tickDiff(ticks["start"], ticks["end"])
+    if pulse_us * 1000 > MAX_ECHO_NS:
+        return {"distanceCm": 999}
+    return {"distanceCm": to_distance(pulse_us / 1_000_000)}
+
+def read(trigger_pin, echo_pin):
+    pi = get_pigpio()
+    if pi is not None:
+        try:
+            return read_pigpio(pi, trigger_pin, echo_pin)
+        except OSError:
+            drop_pigpio()  # pigpiod went away; reconnect on the next read
+            raise
+
+    GPIO = setup(trigger_pin, echo_pin)
+    if GPIO is None:
+        return read_gpiozero(trigger_pin, echo_pin)
+
+    gpio_input = GPIO.input
+
+    # Echo must idle low; if it is already high a previous pulse is still
+    # in flight (or the line is stuck), and timing from here would be wrong
+    if gpio_input(echo_pin) == 1:
+        raise SensorError("Echo pin already high before trigger")
+
+    # Send 10us trigger pulse
+    GPIO.output(trigger_pin, False)
+    time.sleep(0.002)
+    GPIO.output(trigger_pin, True)
+    time.sleep(0.00001)
+    GPIO.output(trigger_pin, False)
+
+    # Echo rises within a few hundred µs of the trigger (after the 40kHz burst)
+    timeout = _pc() + 1_000_000  # 1ms
+    pulse_start = _pc()
+    while gpio_input(echo_pin) == 0:
+        pulse_start = _pc()
+        if pulse_start > timeout:
+            return {"distanceCm": 999}
+
+    pulse_end = _pc()
+    timeout = pulse_end + MAX_ECHO_NS
+    while gpio_input(echo_pin) == 1:
+        pulse_end = _pc()
+        if pulse_end > timeout:
+            return {"distanceCm": 999}
+
+    # Calculate distance
+    pulse_duration = (pulse_end - pulse_start) * 1e-9
+    return {"distanceCm": to_distance(pulse_duration)}
+
+def main():
+    run(read, parse_args)
 
 if __name__ == "__main__":
     main()
@@ -7,28 +7,125 @@ Supports:
 - MPR121: 12-channel capacitive touch via I2C
 
 Usage: python3 read_touch.py <type> <i2c_bus> <i2c_address> <gpio_pin>
+       python3 read_touch.py --daemon
 Output: JSON {"channels": [0, 3, 5], "values": [45, 30, 55]}
         or   {"channels": [0], "values": null}  (for TTP223)
 
 Requires:
-- TTP223: RPi.GPIO or gpiozero
-- MPR121: pip install adafruit-circuitpython-mpr121
+- TTP223: python3-libgpiod (or RPi.GPIO, or gpiozero)
+- MPR121: nothing beyond I2C (configured and read through /dev/i2c-N)
 """
-import sys
-import json
+import glob
+import time
+import functools
+
+from sensor_daemon import run, read_block, write_register, get_gpio, SensorError
+
+# Labels of the gpiochip that drives the 40-pin header (Pi 0-3, Pi 4, Pi 5).
+# Its /dev/gpiochipN number depends on the board and kernel — e.g. gpiochip4
+# on a Pi 5 with older kernels — so it is looked up by label.
+HEADER_CHIP_LABELS = ("pinctrl-bcm2835", "pinctrl-bcm2711", "pinctrl-rp1")
+
+# Held libgpiod line requests keyed by pin: each read is a single ioctl.
+# Fallback when gpiod is missing: pins already configured through RPi.GPIO.
+# Both are reused across daemon requests.
+_gpiod_readers = {}
+_configured_pins = set()
+
+# MPR121 configuration written after a soft reset, as (register, value)
+# pairs — the same settings adafruit_mpr121 uses. The electrode config
+# register (0x5E) goes last: the others are only writable in stop mode.
+_MPR121_CONFIG = (
+    [(0x41 + 2 * i, 12) for i in range(12)]    # touch thresholds
+    + [(0x42 + 2 * i, 6) for i in range(12)]   # release thresholds
+    + [
+        (0x2B, 0x01), (0x2C, 0x01), (0x2D, 0x0E), (0x2E, 0x00),  # rising filter
+        (0x2F, 0x01), (0x30, 0x05), (0x31, 0x01), (0x32, 0x00),  # falling filter
+        (0x33, 0x00), (0x34, 0x00), (0x35, 0x00),                # touched filter
+        (0x5B, 0x00),  # debounce off
+        (0x5C, 0x10),  # 16uA charge current
+        (0x5D, 0x20),  # 0.5us charge time, 1ms sample period
+        (0x5E, 0x8F),  # run mode with baseline tracking, all 12 electrodes
+    ]
+)
+
+# (i2c_bus, i2c_address) pairs already reset and configured. Resetting
+# clears the chip's baselines, so it is only done once per process.
+_configured_mpr121s = set()
+
+@functools.lru_cache(maxsize=None)
+def find_header_chip():
+    """Return the /dev/gpiochipN path of the 40-pin header's chip, or None."""
+    import gpiod
+
+    for path in sorted(glob.glob("/dev/gpiochip*")):
+        try:
+            chip = gpiod.Chip(path)
+        except OSError:
+            continue
+        try:
+            # v2 bindings: get_info().label; v1: label()
+            label = chip.get_info().label if hasattr(chip, "get_info") else chip.label()
+        finally:
+            chip.close()
+        if label in HEADER_CHIP_LABELS:
+            return path
+    return None
+
+def get_gpiod_reader(gpio_pin):
+    """
+    Return a callable reading `gpio_pin` through a held libgpiod line
+    request, or None if the gpiod bindings are not installed or no header
+    gpiochip is found.
+    """
+    reader = _gpiod_readers.get(gpio_pin)
+    if reader is not None:
+        return reader
+
+    try:
+        import gpiod
+    except ImportError:
+        return None
+
+    chip_path = find_header_chip()
+    if chip_path is None:
+        return None
+
+    if hasattr(gpiod, "request_lines"):
+        # libgpiod v2 bindings (pip install gpiod)
+        from gpiod.line import Direction, Value
+        request = gpiod.request_lines(
+            chip_path,
+            consumer="yadori",
+            config={gpio_pin: gpiod.LineSettings(direction=Direction.INPUT)},
+        )
+        reader = lambda: request.get_value(gpio_pin) == Value.ACTIVE
+    else:
+        # libgpiod v1 bindings (apt install python3-libgpiod)
+        line = gpiod.Chip(chip_path).get_line(gpio_pin)
+        line.request(consumer="yadori", type=gpiod.LINE_REQ_DIR_IN)
+        reader = lambda: line.get_value() == 1
+
+    _gpiod_readers[gpio_pin] = reader
+    return reader
 
 def read_ttp223(gpio_pin):
     """Read TTP223 single-point capacitive touch."""
-    try:
-        import RPi.GPIO as GPIO
-        GPIO.setmode(GPIO.BCM)
-        GPIO.setwarnings(False)
-        GPIO.setup(gpio_pin, GPIO.IN)
+    reader = get_gpiod_reader(gpio_pin)
+    if reader is not None:
+        channels = [0] if reader() else []
+        return {"channels": channels, "values": None}
+
+    GPIO = get_gpio()
+    if GPIO is not None:
+        if gpio_pin not in _configured_pins:
+            GPIO.setup(gpio_pin, GPIO.IN)
+            _configured_pins.add(gpio_pin)
 
         touched = GPIO.input(gpio_pin)
         channels = [0] if touched else []
         return {"channels": channels, "values": None}
-    except ImportError:
+    else:
         from gpiozero import Button
         button = Button(gpio_pin, pull_up=False)
         touched = button.is_pressed
@@ -36,40 +133,60 @@ def read_ttp223(gpio_pin):
         channels = [0] if touched else []
         return {"channels": channels, "values": None}
 
+def configure_mpr121(i2c_bus, i2c_address):
+    """Soft-reset and configure the MPR121 on the bus it is read from."""
+    key = (i2c_bus, i2c_address)
+    if key in _configured_mpr121s:
+        return
+
+    write_register(i2c_bus, i2c_address, 0x80, 0x63)  # soft reset
+    time.sleep(0.001)
+    # CONFIG2 reads 0x24 after reset; anything else is not an MPR121
+    if read_block(i2c_bus, i2c_address, 0x5D, 1)[0] != 0x24:
+        raise SensorError(f"No MPR121 at {i2c_address:#x} on /dev/i2c-{i2c_bus}")
+
+    for register, value in _MPR121_CONFIG:
+        write_register(i2c_bus, i2c_address, register, value)
+    _configured_mpr121s.add(key)
+
 def read_mpr121(i2c_bus, i2c_address):
     """Read MPR121 12-channel capacitive touch."""
-    import board
-    import busio
-    import adafruit_mpr121
+    configure_mpr121(i2c_bus, i2c_address)
+
+    # Registers 0x00..0x1B in one transaction: touch status (0x00-0x01),
+    # out-of-range status (0x02-0x03), then 10-bit filtered data per electrode
+    return parse_mpr121(read_block(i2c_bus, i2c_address, 0x00, 28))
 
-    i2c = busio.I2C(board.SCL, board.SDA)
-    mpr121 = adafruit_mpr121.MPR121(i2c, address=i2c_address)
+def parse_mpr121(regs):
+    """Decode touched channels and their filtered data from registers 0x00..0x1B."""
+    touched = regs[0] | ((regs[1] & 0x0F) << 8)
 
     channels = []
     values = []
 
     for i in range(12):
-        if mpr121[i].value:
+        if touched & (1 << i):
             channels.append(i)
-            values.append(mpr121[i].raw_value)
+            values.append(regs[4 + 2 * i] | ((regs[5 + 2 * i] & 0x03) << 8))
 
     return {"channels": channels, "values": values if values else None}
 
-def main():
-    sensor_type = sys.argv[1] if len(sys.argv) > 1 else "ttp223"
-    i2c_bus = int(sys.argv[2]) if len(sys.argv) > 2 else 1
-    i2c_address = int(sys.argv[3]) if len(sys.argv) > 3 else 0x5A
-    gpio_pin = int(sys.argv[4]) if len(sys.argv) > 4 else 17
+def parse_args(args):
+    sensor_type = args[0] if len(args) > 0 else "ttp223"
+    i2c_bus = int(args[1]) if len(args) > 1 else 1
+    i2c_address = int(args[2]) if len(args) > 2 else 0x5A
+    gpio_pin = int(args[3]) if len(args) > 3 else 17
+    return sensor_type, i2c_bus, i2c_address, gpio_pin
 
+def read(sensor_type, i2c_bus, i2c_address, gpio_pin):
     if sensor_type == "ttp223":
-        result = read_ttp223(gpio_pin)
-    elif sensor_type == "mpr121":
-        result = read_mpr121(i2c_bus, i2c_address)
-    else:
-        print(json.dumps({"error": f"Unknown sensor type: {sensor_type}"}), file=sys.stderr)
-        sys.exit(1)
+        return read_ttp223(gpio_pin)
+    if sensor_type == "mpr121":
+        return read_mpr121(i2c_bus, i2c_address)
+    raise SensorError(f"Unknown sensor type: {sensor_type}")
 
-    print(json.dumps(result))
+def main():
+    run(read, parse_args)
 
 if __name__ == "__main__":
     main()
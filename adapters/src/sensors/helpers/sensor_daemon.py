@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+Shared entry point and utilities for the sensor helper scripts.
+
+One-shot:  python3 read_<sensor>.py <args...>
+           Prints one JSON reading and exits.
+
+Daemon:    python3 read_<sensor>.py --daemon
+           Writes {"ready": true} once started, then reads one JSON array
+           of arguments per line on stdin and writes one JSON reply per
+           line on stdout. Hardware handles and imports stay alive between
+           requests, so only the first reading pays for interpreter startup.
+
+           A request wrapped as {"id": 7, "request": [...]} is answered as
+           {"id": 7, "result": {...}} or {"id": 7, "error": "..."}, so a
+           caller can match replies that arrive after it stopped waiting.
+
+Errors are reported as {"error": "..."} — on stderr with exit code 1 in
+one-shot mode, as the reply line in daemon mode.
+
+Optional: pip install orjson  (faster reply serialization)
+"""
+import os
+import sys
+import json
+import time
+import fcntl
+import ctypes
+import functools
+import contextlib
+
+try:
+    import orjson
+
+    def dumps(obj):
+        """Serialize a reply to JSON bytes."""
+        return orjson.dumps(obj)
+except ImportError:
+    def dumps(obj):
+        """Serialize a reply to JSON bytes."""
+        return json.dumps(obj).encode()
+
+class SensorError(Exception):
+    """A reading failed in a way the caller should see (not a crash)."""
+
+# Hardware handles below are opened once per process and shared by every
+# sensor in it — including all sensors served by sensor_hub.py.
+
+@functools.lru_cache(maxsize=None)
+def get_bus(bus_num):
+    """Return an open smbus2.SMBus for /dev/i2c-<bus_num>."""
+    import smbus2
+    return smbus2.SMBus(bus_num)
+
+# <linux/i2c.h>, <linux/i2c-dev.h>
+I2C_RDWR = 0x0707
+I2C_M_RD = 0x0001
+
+class _I2cMsg(ctypes.Structure):
+    _fields_ = [
+        ("addr", ctypes.c_uint16),
+        ("flags", ctypes.c_uint16),
+        ("len", ctypes.c_uint16),
+        ("buf", ctypes.POINTER(ctypes.c_uint8)),
+    ]
+
+class _I2cRdwrData(ctypes.Structure):
+    _fields_ = [
+        ("msgs", ctypes.POINTER(_I2cMsg)),
+        ("nmsgs", ctypes.c_uint32),
+    ]
+
+@functools.lru_cache(maxsize=None)
+def _i2c_fd(bus_num):
+    return os.open(f"/dev/i2c-{bus_num}", os.O_RDWR)
+
+def read_block(bus_num, address, register, length):
+    """
+    Read `length` bytes starting at `register` in one I2C_RDWR ioctl
+    (register write + read, repeated start) on /dev/i2c-<bus_num>.
+    Skips the smbus2 layer and its 32-byte SMBus block limit.
+    """
+    reg = (ctypes.c_uint8 * 1)(register)
+    buf = (ctypes.c_uint8 * length)()
+    msgs = (_I2cMsg * 2)(
+        _I2cMsg(address, 0, 1, reg),
+        _I2cMsg(address, I2C_M_RD, length, buf),
+    )
+    fcntl.ioctl(_i2c_fd(bus_num), I2C_RDWR, _I2cRdwrData(msgs, 2))
+    return bytes(buf)
+
+def write_register(bus_num, address, register, value):
+    """Write one register byte in one I2C_RDWR ioctl on /dev/i2c-<bus_num>."""
+    buf = (ctypes.c_uint8 * 2)(register, value)
+    msgs = (_I2cMsg * 1)(_I2cMsg(address, 0, 2, buf))
+    fcntl.ioctl(_i2c_fd(bus_num), I2C_RDWR, _I2cRdwrData(msgs, 1))
+
+@functools.lru_cache(maxsize=None)
+def get_gpio():
+    """Return RPi.GPIO set to BCM numbering, or None if it is not installed."""
+    try:
+        import RPi.GPIO as GPIO
+    except ImportError:
+        return None
+
+    GPIO.setmode(GPIO.BCM)
+    GPIO.setwarnings(False)
+    return GPIO
+
+# Shared pigpio connection, and when a failed connect may next be retried
+_pi = None
+_pigpio_retry_at = 0.0
+PIGPIO_RETRY_S = 5.0
+
+def get_pigpio():
+    """
+    Return a connected pigpio.pi(), or None if pigpio or pigpiod is missing.
+
+    pigpiod timestamps GPIO edges in its own process, accurate to its
+    sample rate (5 µs by default), which Python polling loops cannot match.
+    A failed or dropped connection is not kept: pigpiod started after the
+    hub is picked up within PIGPIO_RETRY_S.
+    """
+    global _pi, _pigpio_retry_at
+    if _pi is not None:
+        if _pi.connected:
+            return _pi
+        drop_pigpio()
+
+    now = time.monotonic()
+    if now < _pigpio_retry_at:
+        return None
+    try:
+        import pigpio
+    except ImportError:
+        return None
+
+    # pigpio prints connection failures to stdout, which carries replies
+    with contextlib.redirect_stdout(sys.stderr):
+        pi = pigpio.pi()
+    if not pi.connected:
+        _pigpio_retry_at = now + PIGPIO_RETRY_S
+        return None
+    _pi = pi
+    return pi
+
+def drop_pigpio():
+    """Forget the pigpio connection after pigpiod went away; see get_pigpio()."""
+    global _pi
+    pi, _pi = _pi, None
+    if pi is not None:
+        with contextlib.suppress(Exception):
+            pi.stop()
+
+def serve(read, parse_args):
+    """Answer newline-delimited JSON requests until stdin closes."""
+    sys.stdout.buffer.write(dumps({"ready": True}) + b"\n")
+    sys.stdout.flush()
+
+    for line in sys.stdin:
+        line = line.strip()
+        if not line:
+            continue
+        sys.stdout.buffer.write(dumps(answer(read, parse_args, line)) + b"\n")
+        sys.stdout.flush()
+
+def answer(read, parse_args, line):
+    """Build the reply to one request line (bare or {"id", "request"})."""
+    message = None
+    try:
+        message = json.loads(line)
+        if isinstance(message, dict) and "request" in message:
+            return {"id": message.get("id"), "result": read(*parse_args(message["request"]))}
+        return read(*parse_args(message))
+    except Exception as e:
+        if isinstance(message, dict) and "request" in message:
+            return {"id": message.get("id"), "error": str(e)}
+        return {"error": str(e)}
+
+def run(read, parse_args):
+    """Dispatch to daemon or one-shot mode based on sys.argv."""
+    args = sys.argv[1:]
+    if args and args[0] == "--daemon":
+        serve(read, parse_args)
+        return
+
+    try:
+        result = read(*parse_args(args))
+    except SensorError as e:
+        print(json.dumps({"error": str(e)}), file=sys.stderr)
+        sys.exit(1)
+
+    sys.stdout.buffer.write(dumps(result) + b"\n")
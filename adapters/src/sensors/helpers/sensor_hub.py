@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Sensor Hub — one process serving every sensor helper.
+
+Usage: python3 sensor_hub.py <sensor> <args...>
+       python3 sensor_hub.py --daemon
+Request (daemon): {"sensor": "bme280", "args": ["1", "118"], "ttl": 0.1}
+Output: the JSON reading of that sensor's helper (see read_<sensor>.py)
+
+A reading younger than "ttl" seconds (default: CACHE_TTL for that sensor)
+is answered from memory instead of measuring again; "ttl": 0 forces a read.
+
+Each helper module is imported on its first request (a board without a
+BME280 never loads numba), and I2C buses and the GPIO/pigpio handles are
+shared between sensors (see sensor_daemon.py), so interpreter startup and
+hardware library imports are paid once per boot instead of once per sensor.
+"""
+import time
+import importlib
+
+from sensor_daemon import run, SensorError
+
+READERS = {
+    "bh1750": "read_bh1750",
+    "bme280": "read_bme280",
+    "dht22": "read_dht22",
+    "hcsr04": "read_hcsr04",
+    "touch": "read_touch",
+}
+
+# Seconds a reading stays fresh — roughly each sensor's own measurement
+# cadence, so faster polling gets the same value without touching the bus
+CACHE_TTL = {
+    "bh1750": 0.2,
+    "bme280": 0.1,
+    "dht22": 2.0,  # the DHT22 cannot be read more often than every 2 s
+    "hcsr04": 0.05,
+    "touch": 0.02,
+}
+
+_cache = {}
+
+def parse_args(request):
+    if isinstance(request, dict):
+        return request.get("sensor"), request.get("args", []), request.get("ttl")
+    # One-shot: sensor name followed by that helper's own arguments
+    return (request[0] if request else None), request[1:], None
+
+def read(sensor, args, ttl=None):
+    module_name = READERS.get(sensor)
+    if module_name is None:
+        raise SensorError(f"Unknown sensor: {sensor}")
+
+    if ttl is None:
+        ttl = CACHE_TTL.get(sensor, 0)
+    key = (sensor, tuple(args))
+    now = time.monotonic()
+    entry = _cache.get(key)
+    if entry is not None and now - entry[0] < ttl:
+        return entry[1]
+
+    helper = importlib.import_module(module_name)
+    result = helper.read(*helper.parse_args(args))
+    _cache[key] = (now, result)
+    return result
+
+def main():
+    run(read, parse_args)
+
+if __name__ == "__main__":
+    main()
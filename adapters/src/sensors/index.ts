@@ -3,7 +3,8 @@
  *
  * Each driver auto-detects its hardware and reads data via:
  * - System commands (libcamera-still, arecord, vcgencmd)
- * - Python helper scripts (for I2C/GPIO sensors)
+ * - Python helper scripts (for I2C/GPIO sensors), served by one persistent
+ *   sensor hub process so imports and bus handles survive between reads
  * - /proc and /sys filesystem reads
  *
  * Zero npm dependencies for hardware access.